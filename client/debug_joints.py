@@ -3,14 +3,77 @@
 Debug Robot for Debug Mode - Simulates robot behavior without hardware
 """
 
+import math
 import time
 import numpy as np
 import logging
 from pathlib import Path
 
+# orjson is optional - native JSON parser, several times faster than the
+# stdlib and it takes bytes directly so no text decode is needed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Numba is optional - when available the sinusoid kernel is JIT-compiled
+# into a single fused loop with no per-joint ufunc dispatch
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# numexpr is optional - fuses the whole amp*sin(w*t+p) expression into a
+# single SIMD pass instead of separate multiply/add/sin ufunc calls
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
 logger = logging.getLogger(__name__)
 
 
+class MotorCalibration:
+    """Mock of the real SO101Leader MotorCalibration entry.
+
+    Slotted so attribute reads resolve through fixed-offset descriptors
+    instead of a per-instance __dict__.
+    """
+
+    __slots__ = ('id', 'drive_mode', 'homing_offset', 'range_min', 'range_max')
+
+    def __init__(self, id, drive_mode, homing_offset, range_min, range_max):
+        self.id = id
+        self.drive_mode = drive_mode
+        self.homing_offset = homing_offset
+        self.range_min = range_min
+        self.range_max = range_max
+
+
+if njit is not None:
+    # Explicit signature: compiles at import time (no first-call JIT stall)
+    # and specializes for contiguous float32 arrays, matching the buffers
+    # allocated in _load_calibration. cache=True persists the compiled
+    # object next to the module so later imports skip LLVM entirely.
+    @njit('void(f4, f4[::1], f4[::1], f4[::1], f4[::1])',
+          cache=True, fastmath=True)
+    def _compute_positions(t, two_pi_freq, phase, amp_masked, out):
+        for i in range(two_pi_freq.shape[0]):
+            out[i] = amp_masked[i] * math.sin(two_pi_freq[i] * t + phase[i])
+else:
+    _compute_positions = None
+
+
+if ne is not None:
+    def _compute_positions_ne(t, two_pi_freq, phase, amp_masked, out):
+        ne.evaluate("amp * sin(w * t + p)",
+                    local_dict={'amp': amp_masked, 'w': two_pi_freq,
+                                'p': phase, 't': t},
+                    out=out)
+else:
+    _compute_positions_ne = None
+
+
 class DebugRobot:
     """Debug robot that simulates SO101Leader behavior for testing without hardware"""
     
@@ -26,16 +89,55 @@ class DebugRobot:
         self.device_id = device_id
         self.calibration_dir = Path(calibration_dir)
         self.active_joints = active_joints or []
-        self.start_time = None
         self.calibration = None
+        self._compute = None
+        # Monotonic clock cached as a bound method: perf_counter is vDSO-based
+        # on Linux (no syscall) and the cache skips attribute resolution
+        self._clock = time.perf_counter
+        self._t0 = None
         
         logger.info(f"🐛 Debug Robot initialized - Active joints: {', '.join(self.active_joints) if self.active_joints else 'None (all static)'}")
     
     def connect(self):
         """Simulate robot connection"""
-        self.start_time = time.time()
+        self._t0 = self._clock()
         self._load_calibration()
+
+        # Keep a direct reference to the winning kernel (skips module-level
+        # lookup in the hot path); _pick_kernel warms each candidate up so
+        # one-time JIT compilation never lands on a control-loop tick
+        self._compute = self._pick_kernel()
+
         logger.info("Debug robot connected")
+
+    def _pick_kernel(self):
+        """Select the fastest available sinusoid kernel for this joint count.
+
+        Candidates (numba, numexpr) are warmed up and timed on the real
+        buffers; whichever wins is used for every get_action() call.
+        Returns None when neither is installed (NumPy fallback path).
+        """
+        candidates = [k for k in (_compute_positions, _compute_positions_ne)
+                      if k is not None]
+        if not candidates:
+            return None
+
+        t = np.float32(0.0)
+        best_kernel = None
+        best_elapsed = None
+        for kernel in candidates:
+            # Warm-up call triggers JIT compile / expression caching
+            kernel(t, self._two_pi_freq, self._phase,
+                   self._amp_masked, self._pos_buf)
+            start = time.perf_counter()
+            for _ in range(200):
+                kernel(t, self._two_pi_freq, self._phase,
+                       self._amp_masked, self._pos_buf)
+            elapsed = time.perf_counter() - start
+            if best_elapsed is None or elapsed < best_elapsed:
+                best_kernel = kernel
+                best_elapsed = elapsed
+        return best_kernel
     
     def disconnect(self):
         """Simulate robot disconnection"""
@@ -43,67 +145,107 @@ class DebugRobot:
     
     def is_connected(self):
         """Check if debug robot is connected"""
-        return self.start_time is not None
+        return self._t0 is not None
     
     def _load_calibration(self):
         """Load calibration data - format matching real SO101Leader"""
-        import json
-        from types import SimpleNamespace
-        
         calib_file = self.calibration_dir / f"{self.device_id}.json"
         
         if not calib_file.exists():
             raise RuntimeError(f"Debug mode requires calibration file: {calib_file}")
         
-        with open(calib_file, 'r') as f:
-            calib_data = json.load(f)
+        calib_data = _json_loads(calib_file.read_bytes())
         
         # Create calibration dict: motor_name -> MotorCalibration object
         # Matching real SO101Leader format
         self.calibration = {}
         for motor_name, motor_config in calib_data.items():
             # Create mock MotorCalibration object with drive_mode
-            self.calibration[motor_name] = SimpleNamespace(
+            self.calibration[motor_name] = MotorCalibration(
                 id=motor_config.get('id', 0),
                 drive_mode=motor_config.get('drive_mode', 0),  # 0 = bidirectional
                 homing_offset=motor_config.get('homing_offset', 0),
                 range_min=motor_config.get('range_min', 0),
                 range_max=motor_config.get('range_max', 4096)
             )
-        
+
+        # Structure-of-arrays view of the calibration: one contiguous vector
+        # per field, so consumers can process all joints with a single NumPy
+        # op instead of chasing per-object attributes. The dict of
+        # MotorCalibration objects above stays as the compatible interface.
+        motors = list(self.calibration.values())
+        self._ids = np.asarray([m.id for m in motors], dtype=np.int32)
+        self._drive_modes = np.asarray([m.drive_mode for m in motors],
+                                       dtype=np.int32)
+        self._homing_offset = np.asarray([m.homing_offset for m in motors],
+                                         dtype=np.int32)
+        self._range_min = np.asarray([m.range_min for m in motors],
+                                     dtype=np.int32)
+        self._range_max = np.asarray([m.range_max for m in motors],
+                                     dtype=np.int32)
+
+        # Precompute per-joint sinusoid constants so get_action() doesn't redo
+        # the per-motor arithmetic on every call.
+        # Assume SO101Leader outputs -100 to 100 for all joints
+        # (Without source code access, we can't verify individual joint ranges)
+        n = len(self.calibration)
+        self._names = list(self.calibration.keys())
+        # float32 throughout: the control loop doesn't need double precision
+        # and NumPy's SIMD sin processes twice as many f32 lanes per vector
+        i = np.arange(n, dtype=np.float64)
+        self._two_pi_freq = (2 * np.pi * (0.15 + 0.03 * i)).astype(np.float32)
+        self._phase = (i * (2 * np.pi / n)).astype(np.float32)
+        active_set = set(self.active_joints)
+        self._active = np.fromiter((name in active_set for name in self._names),
+                                   dtype=np.bool_, count=n)
+        self._center = 0.0    # center of the [-100, 100] range
+        self._amp = 100.0     # amplitude of the [-100, 100] range
+
+        # Amplitude with inactive joints already zeroed out, plus scratch
+        # buffers reused by get_action() so no arrays are allocated per tick
+        self._amp_masked = np.where(self._active, self._amp,
+                                    self._center).astype(np.float32)
+        self._phase_buf = np.empty(n, dtype=np.float32)
+        self._sin_buf = np.empty(n, dtype=np.float32)
+        self._pos_buf = np.empty(n, dtype=np.float32)
+
+        # Preformat the output keys and reuse one output dict across calls;
+        # overwriting existing keys is cheaper than rebuilding the dict
+        self._pos_keys = [f"{name}.pos" for name in self.calibration]
+        self._state_dict = dict.fromkeys(self._pos_keys, 0.0)
+
+        # With no active joints (the default) every position is the center
+        # value, so get_action() can skip the math entirely
+        self._all_inactive = not self._active.any()
+        self._idle_state = dict.fromkeys(self._pos_keys, self._center)
+
         logger.info(f"Debug calibration loaded: {len(self.calibration)} joints")
-    
+
     def get_action(self):
         """Generate simulated robot action data"""
         if not self.is_connected():
             raise RuntimeError("Debug robot not connected")
-        
-        t = time.time() - self.start_time
-        state_dict = {}
-        
-        for i, (motor_name, motor_calib) in enumerate(self.calibration.items()):
-            # Assume SO101Leader outputs -100 to 100 for all joints
-            # (Without source code access, we can't verify individual joint ranges)
-            start, end = -100.0, 100.0
-            
-            # Check if this joint should be active (moving)
-            is_active = motor_name in self.active_joints
-            
-            if is_active:
-                # Generate sinusoidal motion for active joints
-                freq = 0.15 + i * 0.03
-                phase = i * (2 * np.pi / len(self.calibration))
-                sin_value = np.sin(2 * np.pi * freq * t + phase)
-                
-                # Map to action range
-                center = (start + end) / 2
-                amplitude = (end - start) / 2
-                position = center + amplitude * sin_value
-            else:
-                # Keep inactive joints at center position
-                position = (start + end) / 2
-            
-            state_dict[f"{motor_name}.pos"] = float(position)
-        
+
+        if self._all_inactive:
+            return self._idle_state.copy()
+
+        t = np.float32(self._clock() - self._t0)
+
+        # Sinusoidal motion for active joints, center position for the rest
+        if self._compute is not None:
+            # Numba kernel: one fused loop, no ufunc dispatch
+            self._compute(t, self._two_pi_freq, self._phase,
+                          self._amp_masked, self._pos_buf)
+            vals = self._pos_buf
+        else:
+            # NumPy fallback: vectorized sin into preallocated buffers
+            phases = np.multiply(self._two_pi_freq, t, out=self._phase_buf)
+            phases += self._phase
+            s = np.sin(phases, out=self._sin_buf)
+            vals = np.multiply(s, self._amp_masked, out=self._pos_buf)
+
+        state_dict = self._state_dict
+        for key, value in zip(self._pos_keys, vals.tolist()):
+            state_dict[key] = value
         return state_dict
 
@@ -3,14 +3,34 @@
 Generic Robot gRPC Client - Collects data from robot via teleoperator interface and streams to server
 """
 
+import os
 import grpc
+import grpc.aio
 import time
 import sys
+import asyncio
+import queue
+import inspect
 import logging
 import yaml
 import importlib
+import itertools
+import functools
+import threading
 import numpy as np
 from pathlib import Path
+from google.protobuf.internal import api_implementation
+
+# Prefer libyaml's C parser; the pure-Python SafeLoader is one of the
+# slowest parsers around (~10x slower) and dominates cold start
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed configs keyed by path -> (mtime, dict): retry loops and
+# re-inits reuse the parsed dict instead of re-running the parser
+_CONFIG_CACHE = {}
 
 # Import generated protobuf code
 import robot_data_pb2
@@ -28,6 +48,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Streams on one channel share a single TCP connection's congestion window
+# and HTTP/2 flow-control window; a small pool lifts that ceiling when
+# multiple robots/streams run concurrently
+CHANNEL_POOL_SIZE = 4
+
+# Bound on batches buffered between the device-reader thread and the gRPC
+# sender; full queue drops the oldest batch to keep latency bounded
+READING_QUEUE_SIZE = 64
+
+# Pushed into the reading queue at shutdown so the consumer's blocking
+# get() returns instead of parking an executor thread forever (which
+# would hang asyncio.run's executor join and with it the whole process)
+_QUEUE_SENTINEL = object()
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_config_class(robot_type):
+    """Resolve the lerobot config class for a robot type.
+
+    Tries the teleoperators package first (leader arms), then robots
+    (followers). Memoized so reconnect/retry loops skip the module scan
+    and signature introspection.
+
+    Returns:
+        (config_class, is_teleoperator, accepted_params)
+
+    Raises:
+        ImportError: If no matching module or Config class is found.
+    """
+    for package, is_teleoperator in (('lerobot.teleoperators', True),
+                                     ('lerobot.robots', False)):
+        try:
+            module = importlib.import_module(f"{package}.{robot_type}")
+        except ImportError:
+            continue
+        # Find the config class (should end with 'Config')
+        config_classes = [name for name in dir(module)
+                          if name.endswith('Config') and not name.startswith('_')]
+        if not config_classes:
+            continue
+        config_class = getattr(module, config_classes[0])
+        accepted_params = frozenset(
+            inspect.signature(config_class.__init__).parameters)
+        return config_class, is_teleoperator, accepted_params
+
+    raise ImportError(f"No config class found for robot type '{robot_type}'")
+
 
 class RobotClient:
     def __init__(self, config_path='config.yaml', server_address='localhost:50051', calibration_dir=None, debug_active_joints=None):
@@ -47,6 +114,42 @@ class RobotClient:
         self.device_id = self.config.get('device_id', 'robot_unknown')
         self.calibration_dir = Path(calibration_dir) if calibration_dir else Path(__file__).parent / 'calibration'
         self.debug_active_joints = debug_active_joints
+        self.robot_type = self.config.get('robot', {}).get('type', 'unknown')
+
+        # Normalization cache, frozen when the first reading fixes the state
+        # schema: ordered keys plus per-key min / 1/(max-min) vectors
+        self._keys = None
+        self._mins = None
+        self._inv_range = None
+        self._schema_keys_sent = None
+        # True when the robot already returns a flat {key: scalar} dict, so
+        # steady-state reads can skip the flattening pass entirely
+        self._state_is_flat = False
+
+        # Reused per-tick message: the constant robot_type/device_id fields
+        # are set once, each tick only rewrites timestamp and values. Callers
+        # must copy the message (generate_readings appends it into a batch,
+        # which copies) before the next read mutates it again.
+        self._reading_msg = robot_data_pb2.RobotReading(
+            robot_type=self.robot_type,
+            device_id=self.device_id
+        )
+
+        # Lazily created channel pool, handed out round-robin per stream
+        self._channels = None
+        self._channel_cycle = None
+
+        # Resolved once at connect time by _bind_state_reader so the hot
+        # path does no hasattr dispatch
+        self._get_state = None
+        self._state_is_dataclass = False
+
+        # Hand-off between the device-reader thread and the gRPC sender
+        self._reading_queue = queue.Queue(maxsize=READING_QUEUE_SIZE)
+        self._stop_reader = threading.Event()
+
+        # First read logs the raw values then rebinds this to the fast path
+        self.read_device_state = self._read_device_state_first
     
     # ===== Logging Helper Functions =====
     
@@ -56,25 +159,29 @@ class RobotClient:
         for joint, (min_v, max_v) in joint_ranges.items():
             logger.info(f"  {joint}: [{min_v}, {max_v}]")
     
+    # Fields logged for each motor's calibration entry (dataclass from the
+    # real teleoperator or the slotted mock from debug_joints)
+    _CALIBRATION_FIELDS = ('id', 'drive_mode', 'homing_offset',
+                           'range_min', 'range_max')
+
     def _log_calibration_details(self):
         """Log all calibration data for each motor to help identify patterns"""
         logger.info("=" * 70)
         logger.info("MOTOR CALIBRATION DATA:")
         logger.info("=" * 70)
-        
+
         for motor_name, motor_calib in self.robot.calibration.items():
             logger.info(f"\n{motor_name}:")
-            logger.info(f"  id:            {motor_calib.id if hasattr(motor_calib, 'id') else 'N/A'}")
-            logger.info(f"  drive_mode:    {motor_calib.drive_mode if hasattr(motor_calib, 'drive_mode') else 'N/A'}")
-            logger.info(f"  homing_offset: {motor_calib.homing_offset if hasattr(motor_calib, 'homing_offset') else 'N/A'}")
-            logger.info(f"  range_min:     {motor_calib.range_min if hasattr(motor_calib, 'range_min') else 'N/A'}")
-            logger.info(f"  range_max:     {motor_calib.range_max if hasattr(motor_calib, 'range_max') else 'N/A'}")
-            
-            # Calculate range span
-            if hasattr(motor_calib, 'range_min') and hasattr(motor_calib, 'range_max'):
-                span = motor_calib.range_max - motor_calib.range_min
-                logger.info(f"  range_span:    {span}")
-        
+            data = {field: getattr(motor_calib, field, 'N/A')
+                    for field in self._CALIBRATION_FIELDS}
+            for field in self._CALIBRATION_FIELDS:
+                logger.info("  %-14s %s", field + ':', data[field])
+
+            # Calculate range span when both bounds are present
+            if data['range_min'] != 'N/A' and data['range_max'] != 'N/A':
+                logger.info("  %-14s %s", 'range_span:',
+                            data['range_max'] - data['range_min'])
+
         logger.info("\n" + "=" * 70)
     
     def _log_raw_action_values(self, state_dict):
@@ -127,12 +234,18 @@ class RobotClient:
         logger.error(f"Error: {error}")
         
     def load_config(self, config_path):
-        """Load robot configuration from YAML file"""
+        """Load robot configuration from YAML file (cached by mtime)"""
         try:
+            mtime = os.path.getmtime(config_path)
+            cached = _CONFIG_CACHE.get(config_path)
+            if cached is not None and cached[0] == mtime:
+                logger.info(f"Using cached configuration for {config_path}")
+                return cached[1]
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                logger.info(f"Loaded configuration from {config_path}")
-                return config
+                config = yaml.load(f, Loader=_YamlLoader)
+            _CONFIG_CACHE[config_path] = (mtime, config)
+            logger.info(f"Loaded configuration from {config_path}")
+            return config
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {config_path}")
             sys.exit(1)
@@ -151,10 +264,11 @@ class RobotClient:
                     active_joints=self.debug_active_joints
                 )
                 self.robot.connect()
-                
+                self._bind_state_reader()
+
                 # Log all calibration data to help identify motor patterns
                 self._log_calibration_details()
-                
+
                 return True
             
             robot_config = self.config.get('robot', {})
@@ -165,47 +279,25 @@ class RobotClient:
             # Get initialization parameters
             init_params = robot_config.get('params', {})
             
-            # Import the appropriate robot/teleoperator config class based on robot_type
-            config_class = None
-            is_teleoperator = False
-            
+            # Import the appropriate robot/teleoperator config class based on
+            # robot_type (memoized, so retries skip the module scan)
             try:
-                # Try teleoperators module (e.g., so101_leader, koch_leader)
-                teleop_module = importlib.import_module(f"lerobot.teleoperators.{robot_type}")
-                # Find the config class (should end with 'Config')
-                config_classes = [name for name in dir(teleop_module) if name.endswith('Config') and not name.startswith('_')]
-                if not config_classes:
-                    raise AttributeError(f"No Config class found in module")
-                config_class_name = config_classes[0]
-                config_class = getattr(teleop_module, config_class_name)
-                is_teleoperator = True
-                logger.info(f"Using teleoperator: {config_class_name}")
-            except (ImportError, AttributeError):
-                try:
-                    # Try robots module (e.g., so101_follower, koch_follower)
-                    robot_module = importlib.import_module(f"lerobot.robots.{robot_type}")
-                    # Find the config class (should end with 'Config')
-                    config_classes = [name for name in dir(robot_module) if name.endswith('Config') and not name.startswith('_')]
-                    if not config_classes:
-                        raise AttributeError(f"No Config class found in module")
-                    config_class_name = config_classes[0]
-                    config_class = getattr(robot_module, config_class_name)
-                    is_teleoperator = False
-                    logger.info(f"Using robot: {config_class_name}")
-                except (ImportError, AttributeError) as e:
-                    logger.error(f"Failed to import robot type '{robot_type}': {e}")
-                    logger.error("Make sure the robot_type is valid (e.g., so101_leader, so101_follower, koch_leader, etc.)")
-                    return False
-            
+                config_class, is_teleoperator, accepted_params = \
+                    _resolve_config_class(robot_type)
+                kind = 'teleoperator' if is_teleoperator else 'robot'
+                logger.info(f"Using {kind}: {config_class.__name__}")
+            except ImportError as e:
+                logger.error(f"Failed to import robot type '{robot_type}': {e}")
+                logger.error("Make sure the robot_type is valid (e.g., so101_leader, so101_follower, koch_leader, etc.)")
+                return False
+
             # Add calibration_dir and device_id to parameters
             init_params['id'] = self.device_id
             if hasattr(self, 'calibration_dir'):
                 init_params['calibration_dir'] = self.calibration_dir
-            
+
             # Filter parameters to only include those accepted by the config class
-            import inspect
-            config_sig = inspect.signature(config_class.__init__)
-            valid_params = {k: v for k, v in init_params.items() if k in config_sig.parameters}
+            valid_params = {k: v for k, v in init_params.items() if k in accepted_params}
             
             logger.info(f"Initializing with parameters: {list(valid_params.keys())}")
             
@@ -222,7 +314,8 @@ class RobotClient:
             
             # Connect to robot
             self.robot.connect()
-            
+            self._bind_state_reader()
+
             logger.info(f"Successfully connected to {robot_type} robot")
             
             # Log all calibration data to help identify motor patterns
@@ -241,6 +334,22 @@ class RobotClient:
             traceback.print_exc()
             return False
     
+    def _bind_state_reader(self):
+        """Resolve the state-reading call once at connect time.
+
+        Caching the bound method and the dataclass check here keeps
+        per-tick hasattr/isinstance dispatch out of read_device_state.
+        """
+        if hasattr(self.robot, 'get_action'):
+            self._get_state = self.robot.get_action
+        elif hasattr(self.robot, 'read'):
+            self._get_state = self.robot.read
+        else:
+            raise AttributeError(
+                f"Robot {type(self.robot).__name__} has neither 'get_action' nor 'read' method")
+        # Probe one reading to learn whether states arrive as dataclasses
+        self._state_is_dataclass = hasattr(self._get_state(), '__dict__')
+
     def _print_connection_troubleshooting(self):
         """Run automatic diagnostics for connection issues"""
         print("\n" + "╔" + "═" * 68 + "╗")
@@ -384,152 +493,305 @@ class RobotClient:
         self._log_joint_ranges(joint_ranges)
         return joint_ranges
     
-    def normalize_to_01(self, flat_state):
+    def _build_normalization_cache(self, flat_state):
         """
-        Normalize LeRobot values to [0.0, 1.0] range.
-        
+        Freeze the state schema from the first reading and precompute the
+        per-key normalization vectors.
+
         LeRobot typically returns:
         - Regular joints: -100 to 100
         - Gripper: 0 to 100
-        
-        This converts everything to [0.0, 1.0] for consistency.
+
+        Storing mins and 1/(max-min) as float32 arrays lets every later
+        reading be normalized with one vectorized clip instead of a Python
+        loop over the dict.
         """
         joint_ranges = self.get_joint_ranges()
-        normalized = {}
-        
-        for key, value in flat_state.items():
-            # Extract joint name from key (e.g., "shoulder_pan.pos" -> "shoulder_pan")
-            joint_name = key.split('.')[0] if '.' in key else key
-            
-            # Get expected range for this joint
-            if joint_name in joint_ranges:
-                min_val, max_val = joint_ranges[joint_name]
-            else:
-                # Unknown joint - assume bidirectional [-100, 100]
-                min_val, max_val = -100.0, 100.0
-            
-            # Normalize: (value - min) / (max - min)
-            if max_val != min_val:
-                normalized_value = (value - min_val) / (max_val - min_val)
-                # Clamp to [0, 1]
-                normalized[key] = max(0.0, min(1.0, float(normalized_value)))
-            else:
-                normalized[key] = 0.5
-        
-        return normalized
+        keys = tuple(sorted(flat_state))
+
+        # Key -> joint-name and key -> range lookup tables, built once here
+        # so the string split never happens again for this schema
+        # (e.g., "shoulder_pan.pos" -> "shoulder_pan"); unknown joints are
+        # assumed bidirectional [-100, 100]
+        self._key_to_joint = {k: k.split('.', 1)[0] for k in keys}
+        self._key_range = {k: joint_ranges.get(self._key_to_joint[k],
+                                               (-100.0, 100.0))
+                           for k in keys}
+
+        mins = []
+        inv_range = []
+        for key in keys:
+            min_val, max_val = self._key_range[key]
+            mins.append(min_val)
+            inv_range.append(1.0 / (max_val - min_val) if max_val != min_val else 0.0)
+
+        self._keys = keys
+        self._mins = np.asarray(mins, dtype=np.float32)
+        self._inv_range = np.asarray(inv_range, dtype=np.float32)
+        # Scalar (bias, scale) pairs for the pure-Python fallback path
+        self._key_scale = {k: (mins[i], inv_range[i])
+                           for i, k in enumerate(keys)}
+
+    def _normalize(self, values):
+        """Normalize a schema-ordered float32 vector to [0, 1].
+
+        Single fused subtract/scale/clip over the whole vector; requires
+        _build_normalization_cache to have frozen the schema first.
+        """
+        return np.clip((values - self._mins) * self._inv_range, 0.0, 1.0)
+
+    def _normalize_scalars(self, source):
+        """Pure-Python fallback: normalize per key with fused bias/scale.
+
+        Used when the state contains values np.fromiter cannot convert;
+        the single conditional expression clamps without min()/max() call
+        overhead. Unconvertible keys fall back to the range midpoint.
+        """
+        out = []
+        for key in self._keys:
+            bias, scale = self._key_scale[key]
+            try:
+                v = (float(source[key]) - bias) * scale
+            except (KeyError, TypeError, ValueError):
+                v = 0.5
+            out.append(0.0 if v < 0.0 else 1.0 if v > 1.0 else v)
+        return out
     
-    def read_device_state(self):
-        """Read current state from robot device and normalize to [0, 1]"""
+    def _read_device_state_first(self, ts=None):
+        """First read: log the raw action values, then rebind the fast path.
+
+        Rebinding read_device_state on the instance makes the one-shot
+        logging branch disappear from steady state entirely, instead of
+        re-checking a flag on every tick.
+        """
+        self._log_raw_action_values(self._get_state())
+        self.read_device_state = self._read_device_state_fast
+        return self._read_device_state_fast(ts)
+
+    def _read_device_state_fast(self, ts=None):
+        """Read current state from robot device and normalize to [0, 1]
+
+        Args:
+            ts: Wall-clock timestamp for the reading; taken here if omitted
+        """
         try:
-            # Get action from robot (works for both real and mock robots)
-            if hasattr(self.robot, 'get_action'):
-                state_dict = self.robot.get_action()
-            elif hasattr(self.robot, 'read'):
-                state_dict = self.robot.read()
-            else:
-                raise AttributeError(f"Robot {type(self.robot).__name__} has neither 'get_action' nor 'read' method")
-            
-            # Log raw values from first reading to help identify ranges
-            if not hasattr(self, '_logged_raw_values'):
-                self._log_raw_action_values(state_dict)
-                self._logged_raw_values = True
-            
-            # Convert state to flat dictionary for protobuf
-            flat_state = {}
-            
+            # Get action from robot via the reader bound at connect time
+            state_dict = self._get_state()
+
             # Handle RobotState dataclass (from mock or real teleoperator)
-            if hasattr(state_dict, '__dict__'):
+            if self._state_is_dataclass:
                 # Convert dataclass to dictionary
                 state_dict = vars(state_dict)
-            
-            # Flatten nested structures and convert to float
-            if isinstance(state_dict, dict):
-                for key, value in state_dict.items():
-                    if isinstance(value, (list, tuple)):
-                        # Convert lists to indexed keys
-                        for idx, val in enumerate(value):
-                            flat_state[f"{key}_{idx}"] = float(val)
-                    elif isinstance(value, (int, float)):
-                        flat_state[key] = float(value)
-                    elif hasattr(value, '__iter__') and not isinstance(value, str):
-                        # Handle numpy arrays and similar iterables
-                        for idx, val in enumerate(value):
-                            flat_state[f"{key}_{idx}"] = float(val)
-                    else:
-                        # Try to convert to float
-                        try:
+
+            if self._state_is_flat and len(state_dict) == len(self._keys):
+                # Steady state: values go straight from the robot dict into
+                # the schema-ordered vector, no intermediate flat dict
+                source = state_dict
+            else:
+                # Convert state to flat dictionary for protobuf
+                flat_state = {}
+
+                # Flatten nested structures and convert to float
+                if isinstance(state_dict, dict):
+                    for key, value in state_dict.items():
+                        if isinstance(value, (list, tuple)):
+                            # Convert lists to indexed keys
+                            for idx, val in enumerate(value):
+                                flat_state[f"{key}_{idx}"] = float(val)
+                        elif isinstance(value, (int, float)):
                             flat_state[key] = float(value)
-                        except:
-                            pass
-            
-            # Normalize LeRobot values to [0, 1]
-            normalized_state = self.normalize_to_01(flat_state)
-            
+                        elif hasattr(value, '__iter__') and not isinstance(value, str):
+                            # Handle numpy arrays and similar iterables;
+                            # ndarray.tolist() converts in C, far faster than
+                            # per-element float() calls
+                            if isinstance(value, np.ndarray):
+                                vals = value.tolist()
+                            else:
+                                vals = [float(v) for v in value]
+                            for idx, val in enumerate(vals):
+                                flat_state[f"{key}_{idx}"] = val
+                        else:
+                            # Try to convert to float
+                            try:
+                                flat_state[key] = float(value)
+                            except:
+                                pass
+
+                # Freeze the schema on the first reading (or if it ever changes)
+                if self._keys is None or len(flat_state) != len(self._keys):
+                    self._build_normalization_cache(flat_state)
+                    # If flattening kept the keys as-is, later reads may
+                    # take the no-copy path above
+                    self._state_is_flat = set(flat_state) == set(state_dict)
+
+                source = flat_state
+
+            # Normalize LeRobot values to [0, 1] with one vectorized kernel
+            try:
+                values = np.fromiter((source[k] for k in self._keys),
+                                     dtype=np.float32, count=len(self._keys))
+                normalized = self._normalize(values)
+            except (KeyError, TypeError, ValueError):
+                normalized = np.asarray(self._normalize_scalars(source),
+                                        dtype=np.float32)
+
             # Create reading message
-            reading = robot_data_pb2.RobotReading(
-                timestamp=time.time(),
-                robot_type=self.config.get('robot', {}).get('type', 'unknown'),
-                device_id=self.device_id,
-                state=normalized_state
-            )
-            
+            # One little-endian float32 blob, ordered by the schema keys
+            # announced on the stream: the server decodes it with a single
+            # frombuffer instead of parsing a repeated field element-wise
+            reading = self._reading_msg
+            reading.timestamp = ts if ts is not None else time.time()
+            reading.state_blob = normalized.astype('<f4', copy=False).tobytes()
+
             return reading
             
         except Exception as e:
-            logger.error(f"Error reading device state: {e}")
+            logger.error("Error reading device state: %s", e)
             return None
     
-    def generate_readings(self, rate_hz=30):
-        """Generator that yields robot readings at specified rate"""
-        interval = 1.0 / rate_hz
+    def _reader_loop(self, rate_hz, batch_size):
+        """Device-reader thread: sample at rate_hz and enqueue ready batches.
+
+        Runs the pacing loop so robot I/O jitter never stalls the gRPC
+        send path; when the queue is full the oldest batch is dropped to
+        keep latency bounded.
+        """
+        # Deadline-based pacing on the monotonic clock: one monotonic_ns per
+        # iteration for the schedule, one time.time() for the wall-clock
+        # timestamp carried in the reading
+        interval_ns = int(1e9 / rate_hz)
+        next_deadline = time.monotonic_ns()
         reading_count = 0
-        
-        while True:
+        batch = robot_data_pb2.RobotReadingBatch()
+
+        while not self._stop_reader.is_set():
             try:
-                start_time = time.time()
-                
-                reading = self.read_device_state()
+                ts = time.time()
+                reading = self.read_device_state(ts)
                 if reading:
                     reading_count += 1
-                    if reading_count % 30 == 0:  # Log every 30 readings (1 second at 30Hz)
-                        logger.info(f"Generated {reading_count} readings")
-                    yield reading
-                
-                # Maintain consistent rate
-                elapsed = time.time() - start_time
-                sleep_time = max(0, interval - elapsed)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    
-            except KeyboardInterrupt:
-                logger.info("Stopping data collection...")
-                break
+                    # Every 300 readings (10 s at 30 Hz); lazy %-formatting
+                    # plus the level guard keep formatting cost out of the
+                    # loop when INFO is filtered
+                    if reading_count % 300 == 0 and logger.isEnabledFor(logging.INFO):
+                        logger.info("Generated %d readings", reading_count)
+                    # append copies, so the reused reading message may be
+                    # mutated again on the next tick
+                    batch.readings.append(reading)
+                    if len(batch.readings) >= batch_size:
+                        # Announce the key ordering once per stream (and again
+                        # only if the schema ever changes)
+                        if self._keys != self._schema_keys_sent:
+                            batch.schema.joint_keys.extend(self._keys)
+                            self._schema_keys_sent = self._keys
+                        try:
+                            self._reading_queue.put_nowait(batch)
+                        except queue.Full:
+                            # Drop the oldest batch rather than block the
+                            # sampling cadence
+                            try:
+                                dropped = self._reading_queue.get_nowait()
+                                # If the dropped batch carried the one-time
+                                # schema announcement, re-arm it so a later
+                                # batch repeats the key ordering; otherwise
+                                # the server could never decode this stream
+                                if (dropped.HasField('schema')
+                                        and not batch.HasField('schema')):
+                                    self._schema_keys_sent = None
+                            except queue.Empty:
+                                pass
+                            self._reading_queue.put_nowait(batch)
+                        batch = robot_data_pb2.RobotReadingBatch()
+
+                # Maintain consistent rate against the absolute deadline so
+                # pacing doesn't accumulate per-iteration drift
+                next_deadline += interval_ns
+                sleep_ns = next_deadline - time.monotonic_ns()
+                if sleep_ns > 0:
+                    time.sleep(sleep_ns / 1e9)
+
             except Exception as e:
                 logger.error(f"Error in reading loop: {e}")
                 time.sleep(1)  # Wait before retrying
-    
-    def stream_to_server(self, rate_hz=30):
+                next_deadline = time.monotonic_ns()
+
+    async def _generate_batches(self):
+        """Async generator feeding StreamData from the reader queue.
+
+        The blocking queue read hops to a worker thread, so the event loop
+        stays free to overlap protobuf serialization and network writes
+        with the wait for the next batch.
+        """
+        while True:
+            batch = await asyncio.to_thread(self._reading_queue.get)
+            if batch is _QUEUE_SENTINEL:
+                return
+            yield batch
+
+    async def _drain_responses(self, responses):
+        """Consume server acks without touching the send path.
+
+        One ack arrives per batch and carries no data the client acts on;
+        successful acks cost nothing unless DEBUG logging is enabled,
+        while failures are still surfaced as warnings.
+        """
+        async for response in responses:
+            if not response.success:
+                logger.warning("Server error: %s", response.message)
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Server response: %s", response.message)
+
+    def stream_to_server(self, rate_hz=30, batch_size=5):
         """Stream robot data to gRPC server"""
+        asyncio.run(self.stream_to_server_async(rate_hz, batch_size))
+
+    async def stream_to_server_async(self, rate_hz=30, batch_size=5):
+        """Stream robot data to gRPC server over an asyncio bidi stream"""
         logger.info(f"Connecting to gRPC server at {self.server_address}...")
-        
+
+        # Each stream gets a fresh schema announcement
+        self._schema_keys_sent = None
+
+        # Larger HTTP/2 frames and write buffer suit the batched stream, and
+        # keepalives detect dead links between bursts
+        channel_options = [
+            ('grpc.http2.max_frame_size', 1 << 20),
+            ('grpc.http2.write_buffer_size', 1 << 20),
+            ('grpc.keepalive_time_ms', 10000),
+        ]
+
+        # Gzip only pays off on batched messages; per-tick frames are too
+        # small to compress usefully
+        compression = (grpc.Compression.Gzip if batch_size > 1
+                       else grpc.Compression.NoCompression)
+
+        # Device sampling stays on its dedicated thread; the event loop
+        # only handles the network side
+        reader = threading.Thread(
+            target=self._reader_loop,
+            args=(rate_hz, batch_size),
+            daemon=True
+        )
+        reader.start()
+
         try:
-            # Create gRPC channel
-            with grpc.insecure_channel(self.server_address) as channel:
-                stub = robot_data_pb2_grpc.RobotDataStreamStub(channel)
-                
-                logger.info("Connected to gRPC server. Starting data stream...")
-                
-                # Stream data to server
-                responses = stub.StreamData(self.generate_readings(rate_hz))
-                
-                logger.info("Waiting for server responses...")
-                # Process responses
-                for response in responses:
-                    if response.success:
-                        logger.debug(f"Server response: {response.message}")
-                    else:
-                        logger.warning(f"Server error: {response.message}")
-                        
+            # Pick a gRPC channel from the pool
+            channel = self._get_channel(channel_options)
+            stub = robot_data_pb2_grpc.RobotDataStreamStub(channel)
+
+            logger.info("Connected to gRPC server. Starting data stream...")
+
+            # Stream data to server
+            responses = stub.StreamData(
+                self._generate_batches(),
+                compression=compression
+            )
+
+            logger.info("Waiting for server responses...")
+            # Acks are log-only and must never gate the sender: drain them
+            # in their own task and just await stream completion here
+            await asyncio.create_task(self._drain_responses(responses))
+
         except grpc.RpcError as e:
             self._log_grpc_error(e)
             self._print_grpc_troubleshooting(e)
@@ -538,8 +800,54 @@ class RobotClient:
             import traceback
             traceback.print_exc()
         finally:
+            self._stop_reader.set()
+            # Unblock the queue consumer so every exit path (Ctrl+C, dead
+            # server, clean shutdown) actually terminates; drop one batch
+            # if the queue is full
+            try:
+                self._reading_queue.put_nowait(_QUEUE_SENTINEL)
+            except queue.Full:
+                try:
+                    self._reading_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._reading_queue.put_nowait(_QUEUE_SENTINEL)
             self.disconnect_device()
-    
+
+    def _get_channel(self, options):
+        """Return the next channel from the round-robin pool.
+
+        Channels are created once and reused for the life of the client;
+        'grpc.use_local_subchannel_pool' keeps them on distinct TCP
+        connections instead of collapsing onto one shared subchannel.
+        """
+        if self._channels is None:
+            self._channels = [
+                grpc.aio.insecure_channel(
+                    self.server_address,
+                    options=options + [
+                        ('grpc.channel_pooling_index', i),
+                        ('grpc.use_local_subchannel_pool', 1),
+                    ]
+                )
+                for i in range(CHANNEL_POOL_SIZE)
+            ]
+            self._channel_cycle = itertools.cycle(self._channels)
+        return next(self._channel_cycle)
+
+    def close_channels(self):
+        """Close all pooled gRPC channels"""
+        if self._channels:
+            channels = self._channels
+            self._channels = None
+            self._channel_cycle = None
+
+            async def _close_all():
+                for channel in channels:
+                    await channel.close()
+
+            asyncio.run(_close_all())
+
     def disconnect_device(self):
         """Disconnect from robot device"""
         if self.robot:
@@ -628,12 +936,17 @@ def main():
     parser.add_argument('--config', default='config.yaml', help='Robot configuration file')
     parser.add_argument('--server', default='localhost:50051', help='gRPC server address')
     parser.add_argument('--rate', type=int, default=30, help='Sampling rate in Hz')
+    parser.add_argument('--batch-size', type=int, default=5,
+                        help='Readings coalesced per gRPC message (default: 5)')
     parser.add_argument('--calibration', default=None, help='Calibration directory path (default: ./calibration)')
     parser.add_argument('--debug-joints', nargs='+', default=None, 
                         help='Enable debug mode and specify joint names to move (e.g., --debug-joints gripper shoulder_pan). If not specified, connects to real hardware.')
     
     args = parser.parse_args()
-    
+
+    # 'upb'/'cpp' mean the native backend; 'python' means the slow fallback
+    logger.info(f"protobuf backend: {api_implementation.Type()}")
+
     # Create client
     client = RobotClient(
         config_path=args.config, 
@@ -654,11 +967,12 @@ def main():
     
     # Stream data
     try:
-        client.stream_to_server(rate_hz=args.rate)
+        client.stream_to_server(rate_hz=args.rate, batch_size=args.batch_size)
     except KeyboardInterrupt:
         logger.info("Shutting down client...")
     finally:
         client.disconnect_device()
+        client.close_channels()
 
 
 if __name__ == '__main__':
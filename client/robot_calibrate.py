@@ -5,14 +5,97 @@ Generic Robot Calibration Module
 Handles calibration for any robot type using lerobot API and configuration files.
 """
 
+import os
+import sys
 import logging
 import yaml
 import importlib
+import importlib.metadata
+import functools
 from pathlib import Path
 
+# Prefer libyaml's C parser; the pure-Python SafeLoader is ~10x slower
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path_str, mtime_ns):
+    """Parse a YAML file, memoized by (path, mtime).
+
+    Keying on mtime_ns means edited files reparse while the repeated
+    RobotCalibrator constructions typical of retry loops reuse the
+    already-parsed dict.
+    """
+    with open(path_str, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+# robot_type -> (config_class, factory, is_teleoperator), filled on first
+# resolution so repeated calibrations skip the module import and scan
+_ROBOT_IMPL_CACHE = {}
+
+# Known robot_type -> config class name: resolution is a single getattr
+# instead of scanning the module namespace; unknown types still fall
+# back to the scan below
+_CONFIG_NAME_HINTS = {
+    'so100_leader': 'SO100LeaderConfig',
+    'so100_follower': 'SO100FollowerConfig',
+    'so101_leader': 'SO101LeaderConfig',
+    'so101_follower': 'SO101FollowerConfig',
+    'koch_leader': 'KochLeaderConfig',
+    'koch_follower': 'KochFollowerConfig',
+}
+
+
+def _resolve_robot_impl(robot_type):
+    """Resolve (config_class, factory, is_teleoperator) for a robot type.
+
+    Only the lerobot subpackages actually needed are imported - importing
+    the bare top-level package pulls in the heavy ML stack (torch etc.)
+    and costs seconds of cold start. Successful lookups are memoized in
+    _ROBOT_IMPL_CACHE.
+
+    Raises:
+        ImportError: If no matching module or Config class is found.
+    """
+    cached = _ROBOT_IMPL_CACHE.get(robot_type)
+    if cached is not None:
+        return cached
+
+    for package, is_teleoperator in (('lerobot.teleoperators', True),
+                                     ('lerobot.robots', False)):
+        name = f"{package}.{robot_type}"
+        try:
+            mod = sys.modules.get(name) or importlib.import_module(name)
+        except ImportError:
+            continue
+        # O(1) lookup for known types; otherwise find the config class
+        # (should end with 'Config'), preferring the module's declared
+        # __all__ over its full namespace
+        hint = _CONFIG_NAME_HINTS.get(robot_type)
+        config_class = getattr(mod, hint, None) if hint else None
+        if config_class is None:
+            names = getattr(mod, '__all__', None) or vars(mod)
+            config_class = next(
+                (getattr(mod, n) for n in names
+                 if n.endswith('Config') and not n.startswith('_')),
+                None)
+        if config_class is None:
+            continue
+        factory_name = ('make_teleoperator_from_config' if is_teleoperator
+                        else 'make_robot_from_config')
+        factory = getattr(importlib.import_module(package), factory_name)
+        impl = (config_class, factory, is_teleoperator)
+        _ROBOT_IMPL_CACHE[robot_type] = impl
+        return impl
+
+    raise ImportError(f"No config class found for robot type '{robot_type}'")
+
+
 class RobotCalibrator:
     """Generic calibrator for any robot using lerobot"""
     
@@ -32,6 +115,10 @@ class RobotCalibrator:
         # Create calibration directory if it doesn't exist
         self.calibration_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Calibration directory: {self.calibration_dir}")
+
+        # (dir mtime_ns, robot_id) -> matching files; invalidated
+        # automatically when the directory changes
+        self._cal_cache = {}
         
         # Load config if provided
         self.config = None
@@ -39,12 +126,12 @@ class RobotCalibrator:
             self.config = self.load_config(config_path)
     
     def load_config(self, config_path):
-        """Load robot configuration from YAML file"""
+        """Load robot configuration from YAML file (cached by mtime)"""
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                logger.info(f"Loaded configuration from {config_path}")
-                return config
+            mtime_ns = os.stat(config_path).st_mtime_ns
+            config = _load_yaml_cached(str(config_path), mtime_ns)
+            logger.info(f"Loaded configuration from {config_path}")
+            return config
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {config_path}")
             return None
@@ -62,11 +149,23 @@ class RobotCalibrator:
         Returns:
             bool: True if calibration exists, False otherwise
         """
-        # Look for calibration file (typically named {robot_id}.json or similar)
-        calibration_files = list(self.calibration_dir.glob(f"*{robot_id}*"))
-        
+        # Repeated checks in one session cost a single stat on the cache
+        # hit instead of a full directory scan with per-entry matching
+        cache_key = (self.calibration_dir.stat().st_mtime_ns, robot_id)
+        calibration_files = self._cal_cache.get(cache_key)
+
+        if calibration_files is None:
+            # Look for calibration file (typically named {robot_id}.json
+            # or similar): a plain substring test on raw dirent names,
+            # with none of glob's fnmatch regex build or per-entry Path
+            # object construction
+            with os.scandir(self.calibration_dir) as entries:
+                calibration_files = [e.name for e in entries
+                                     if robot_id in e.name]
+            self._cal_cache[cache_key] = calibration_files
+
         if calibration_files:
-            logger.info(f"Found calibration files: {[f.name for f in calibration_files]}")
+            logger.info(f"Found calibration files: {calibration_files}")
             return True
         else:
             logger.warning(f"No calibration files found for robot '{robot_id}' in {self.calibration_dir}")
@@ -92,22 +191,41 @@ class RobotCalibrator:
             port = port or robot_config.get('params', {}).get('port')
             robot_id = robot_id or self.config.get('device_id', 'robot_unknown')
         
+        # A list of robot IDs calibrates each in turn. Calibration is an
+        # interactive procedure (the operator moves one arm at a time),
+        # so the robots are handled sequentially; port may be a matching
+        # list when each robot sits on its own serial port
+        if isinstance(robot_id, (list, tuple)):
+            ports = (port if isinstance(port, (list, tuple))
+                     else [port] * len(robot_id))
+            results = [self.run_calibration(robot_type=robot_type, port=p,
+                                            robot_id=rid, force=force)
+                       for rid, p in zip(robot_id, ports)]
+            return all(results)
+
         # Validate required parameters
         if not robot_type or not port or not robot_id:
             logger.error("Missing required parameters: robot_type, port, and robot_id must be provided")
             return False
         
-        # Check if lerobot is available
+        # Check if lerobot is available; metadata lookup reads the installed
+        # version without importing the package (and its ML dependencies)
         try:
-            import lerobot
-            logger.info(f"Using lerobot v{lerobot.__version__} for calibration")
-        except ImportError:
+            version = importlib.metadata.version('lerobot')
+            logger.info(f"Using lerobot v{version} for calibration")
+        except importlib.metadata.PackageNotFoundError:
             logger.error("lerobot package not found. Cannot run calibration.")
             logger.info("Install lerobot with: pip install lerobot")
             return False
         
         # Check existing calibration
         if not force and self.check_calibration(robot_id):
+            # Never block on stdin under automation: without a TTY
+            # (supervisor, CI) or with CALIBRATE_ASSUME_YES set, keep
+            # the existing calibration instead of hanging on input()
+            if not sys.stdin.isatty() or os.environ.get('CALIBRATE_ASSUME_YES'):
+                logger.info("Using existing calibration (non-interactive)")
+                return True
             response = input("Calibration already exists. Recalibrate? (yes/no): ")
             if response.lower() not in ['yes', 'y']:
                 logger.info("Using existing calibration")
@@ -120,39 +238,18 @@ class RobotCalibrator:
         try:
             logger.info(f"Calibrating {robot_type}...")
             
-            # Import the appropriate robot/teleoperator class based on robot_type
-            # Try importing from teleoperators first (for leader arms), then from robots (for followers)
-            config_class = None
-            is_teleoperator = False
-            
+            # Resolve the robot/teleoperator implementation for robot_type
+            # (teleoperators first for leader arms, then robots; memoized)
             try:
-                # Try teleoperators module (e.g., so101_leader, koch_leader)
-                teleop_module = importlib.import_module(f"lerobot.teleoperators.{robot_type}")
-                # Find the config class (should end with 'Config')
-                config_classes = [name for name in dir(teleop_module) if name.endswith('Config') and not name.startswith('_')]
-                if not config_classes:
-                    raise AttributeError(f"No Config class found in module")
-                config_class_name = config_classes[0]
-                config_class = getattr(teleop_module, config_class_name)
-                is_teleoperator = True
-                logger.info(f"Using teleoperator: {config_class_name}")
-            except (ImportError, AttributeError):
-                try:
-                    # Try robots module (e.g., so101_follower, koch_follower)
-                    robot_module = importlib.import_module(f"lerobot.robots.{robot_type}")
-                    # Find the config class (should end with 'Config')
-                    config_classes = [name for name in dir(robot_module) if name.endswith('Config') and not name.startswith('_')]
-                    if not config_classes:
-                        raise AttributeError(f"No Config class found in module")
-                    config_class_name = config_classes[0]
-                    config_class = getattr(robot_module, config_class_name)
-                    is_teleoperator = False
-                    logger.info(f"Using robot: {config_class_name}")
-                except (ImportError, AttributeError) as e:
-                    logger.error(f"Failed to import robot type '{robot_type}': {e}")
-                    logger.error("Make sure the robot_type is valid (e.g., so101_leader, so101_follower, koch_leader, etc.)")
-                    return False
-            
+                config_class, factory, is_teleoperator = \
+                    _resolve_robot_impl(robot_type)
+                kind = 'teleoperator' if is_teleoperator else 'robot'
+                logger.info(f"Using {kind}: {config_class.__name__}")
+            except ImportError as e:
+                logger.error(f"Failed to import robot type '{robot_type}': {e}")
+                logger.error("Make sure the robot_type is valid (e.g., so101_leader, so101_follower, koch_leader, etc.)")
+                return False
+
             logger.info("Please follow the on-screen instructions for calibration...")
             logger.info("Move the arm to the required positions when prompted.")
             
@@ -163,13 +260,8 @@ class RobotCalibrator:
                 calibration_dir=self.calibration_dir
             )
             
-            # Create robot/teleoperator instance using the appropriate factory
-            if is_teleoperator:
-                from lerobot.teleoperators import make_teleoperator_from_config
-                robot = make_teleoperator_from_config(robot_cfg)
-            else:
-                from lerobot.robots import make_robot_from_config  
-                robot = make_robot_from_config(robot_cfg)
+            # Create robot/teleoperator instance using the resolved factory
+            robot = factory(robot_cfg)
             
             # Connect to robot
             logger.info("Connecting to robot...")
@@ -249,6 +341,5 @@ def main():
 
 
 if __name__ == '__main__':
-    import sys
     sys.exit(main())
 
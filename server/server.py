@@ -4,9 +4,18 @@ Simple Robot gRPC Server - Receives data and logs to console
 """
 
 import grpc
-from concurrent import futures
+import grpc.aio
+import asyncio
 import logging
-from datetime import datetime
+import time
+import numpy as np
+
+# uvloop is optional - drop-in libuv event loop, faster I/O multiplexing
+# than asyncio's default selector loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Import generated protobuf code
 import robot_data_pb2
@@ -18,75 +27,212 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Channel options shared by both servers: gzip by default (redundant
+# float state vectors compress several-fold), plus HTTP/2 headroom so
+# many small frames from concurrent streams don't stall on flow control
+_SERVER_OPTIONS = [
+    ('grpc.default_compression_algorithm', grpc.Compression.Gzip.value),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.http2.min_time_between_pings_ms', 10000),
+    ('grpc.http2.max_concurrent_streams', 128),
+    ('grpc.max_receive_message_length', 4 * 1024 * 1024),
+]
+
+# Upper bound on batches drained per ack when the transport has several
+# already buffered (e.g. after a stall); keeps one ack per run without
+# letting a backlog delay acks indefinitely
+_MAX_COALESCED_BATCHES = 8
+
+
+def _format_timestamp(timestamp):
+    """Format a unix timestamp as 'YYYY-mm-dd HH:MM:SS.mmm'.
+
+    Hand-rolled millisecond suffix: avoids constructing a datetime object
+    and the %f-microseconds-then-slice dance, which is one of the slower
+    stdlib formatting paths.
+    """
+    t = int(timestamp)
+    ms = int((timestamp - t) * 1000)
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t)) + f'.{ms:03d}'
+
 
 class RobotDataStreamServicer(robot_data_pb2_grpc.RobotDataStreamServicer):
-    """gRPC service implementation"""
-    
-    def StreamData(self, request_iterator, context):
-        """Handle streaming robot data"""
+    """gRPC service implementation.
+
+    The stream-handling body lives here once; subclasses customize via
+    the _handle_reading / _on_stream_error / _on_stream_end hooks so
+    every hot-path optimization applies to all entry points.
+    """
+
+    def _log_reading(self, reading, joint_keys, timestamp_str):
+        """Log one reading: INFO summary, per-joint detail at DEBUG"""
+        logger.info("Received from %s (ID: %s)",
+                    reading.robot_type, reading.device_id)
+        logger.info("  Timestamp: %s", timestamp_str)
+
+        # State values (normalized to [0, 1]); the float32 blob + schema
+        # is the compact path (decoded with a single frombuffer), then
+        # packed values, then the keyed map kept for older clients
+        if reading.state_blob and joint_keys:
+            blob_values = np.frombuffer(reading.state_blob, dtype='<f4')
+            state_items = zip(joint_keys, blob_values)
+            n_values = len(blob_values)
+        elif reading.values and joint_keys:
+            state_items = zip(joint_keys, reading.values)
+            n_values = len(reading.values)
+        else:
+            state_items = reading.state.items()
+            n_values = len(reading.state)
+        logger.info("  State (%d values, normalized to [0, 1])", n_values)
+        # Per-joint detail is one joined DEBUG record, so INFO-level
+        # operation pays no per-joint formatting
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    %s", " ".join(
+                f"{k}={v:.4f}" for k, v in state_items))
+
+    def _handle_reading(self, reading, joint_keys):
+        """Process one reading; the console server only logs it.
+
+        Subclasses that store readings override this (and reuse
+        _log_reading so the log body stays in one place).
+        """
+        # All work here is log output, so skip it when INFO is filtered
+        if logger.isEnabledFor(logging.INFO):
+            self._log_reading(reading, joint_keys,
+                              _format_timestamp(reading.timestamp))
+
+    def _on_stream_error(self, error):
+        """Hook: a stream ended with an error (no-op here)"""
+
+    def _on_stream_end(self):
+        """Hook: a stream disconnected (no-op here)"""
+
+    async def StreamData(self, request_iterator, context):
+        """Handle streaming robot data (one batch of readings per message)"""
         logger.info("Client connected to stream")
-        
+
+        # Compress acks to match the compressed inbound stream
+        context.set_compression(grpc.Compression.Gzip)
+
+        joint_keys = None
+
+        # Ack content depends only on the reading count, which is constant
+        # in steady state: cache one response message per count seen so the
+        # hot loop skips protobuf construction and string formatting
+        resp_cache = {}
+
+        request_iter = request_iterator.__aiter__()
+        next_task = None
+        eof = False
+
         try:
-            for reading in request_iterator:
-                # Convert timestamp to readable format
-                timestamp_str = datetime.fromtimestamp(
-                    reading.timestamp
-                ).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                
-                # Log basic info
-                logger.info(f"Received from {reading.robot_type} (ID: {reading.device_id})")
-                logger.info(f"  Timestamp: {timestamp_str}")
-                
-                # Log all state values (normalized to [0, 1])
-                state_dict = dict(reading.state)
-                logger.info(f"  State ({len(state_dict)} values, normalized to [0, 1]):")
-                for key, value in state_dict.items():
-                    logger.info(f"    {key}: {value:.4f}")
-                
-                # Send acknowledgment
-                response = robot_data_pb2.RobotResponse(
-                    success=True,
-                    message=f"Received data with {len(reading.state)} state values"
-                )
+            while not eof:
+                # Await the next batch off the wire
+                if next_task is None:
+                    next_task = asyncio.ensure_future(request_iter.__anext__())
+                try:
+                    batch = await next_task
+                except StopAsyncIteration:
+                    next_task = None
+                    break
+                next_task = None
+
+                # Coalesce whatever the transport already buffered (e.g.
+                # after a scheduling stall) into one run, acked once; the
+                # zero-timeout wait never blocks on the network
+                batches = [batch]
+                while len(batches) < _MAX_COALESCED_BATCHES:
+                    next_task = asyncio.ensure_future(request_iter.__anext__())
+                    done, _ = await asyncio.wait((next_task,), timeout=0)
+                    if not done:
+                        # Nothing buffered; leave next_task pending for the
+                        # outer await
+                        break
+                    try:
+                        batches.append(next_task.result())
+                    except StopAsyncIteration:
+                        eof = True
+                    next_task = None
+                    if eof:
+                        break
+
+                n = 0
+                for batch in batches:
+                    # The client announces key ordering once; packed
+                    # readings then carry only the values
+                    if batch.HasField('schema'):
+                        joint_keys = tuple(batch.schema.joint_keys)
+                        logger.info("Received schema with %d joint keys",
+                                    len(joint_keys))
+
+                    for reading in batch.readings:
+                        self._handle_reading(reading, joint_keys)
+                    n += len(batch.readings)
+
+                # Send one acknowledgment per coalesced run
+                response = resp_cache.get(n)
+                if response is None:
+                    response = robot_data_pb2.RobotResponse(
+                        success=True,
+                        message=f"Received batch of {n} readings"
+                    )
+                    resp_cache[n] = response
                 yield response
-                
+
         except Exception as e:
             logger.error(f"Error in stream: {e}")
+            self._on_stream_error(e)
         finally:
+            if next_task is not None:
+                next_task.cancel()
             logger.info("Client disconnected from stream")
+            self._on_stream_end()
 
 
-def serve_grpc(port=50051):
-    """Start gRPC server"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+async def serve_grpc(port=50051):
+    """Start asyncio gRPC server
+
+    Streaming handlers run as coroutines multiplexed on one event loop
+    instead of each pinning a thread-pool worker for the stream's life.
+    """
+    server = grpc.aio.server(options=_SERVER_OPTIONS)
     robot_data_pb2_grpc.add_RobotDataStreamServicer_to_server(
         RobotDataStreamServicer(), server
     )
     server.add_insecure_port(f'[::]:{port}')
-    server.start()
+    await server.start()
     logger.info(f"gRPC server started on port {port}")
     logger.info("Waiting for clients to connect...")
     return server
 
 
+async def _run(grpc_port):
+    """Run the gRPC server until terminated"""
+    grpc_server = await serve_grpc(port=grpc_port)
+
+    try:
+        # Keep server running
+        logger.info("Press Ctrl+C to stop the server")
+        await grpc_server.wait_for_termination()
+    finally:
+        await grpc_server.stop(0)
+
+
 def main():
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='Simple Robot gRPC Server')
     parser.add_argument('--grpc-port', type=int, default=50051, help='gRPC port')
     args = parser.parse_args()
-    
-    # Start gRPC server
-    grpc_server = serve_grpc(port=args.grpc_port)
-    
+
+    if uvloop is not None:
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+
     try:
-        # Keep server running
-        logger.info("Press Ctrl+C to stop the server")
-        grpc_server.wait_for_termination()
+        asyncio.run(_run(args.grpc_port))
     except KeyboardInterrupt:
         logger.info("Shutting down server...")
-    finally:
-        grpc_server.stop(0)
 
 
 if __name__ == '__main__':
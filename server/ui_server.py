@@ -4,17 +4,48 @@ Robot gRPC Server with Web UI - Receives data and displays in web browser
 """
 
 import grpc
-from concurrent import futures
+import grpc.aio
+import asyncio
 import threading
 import logging
-import json
-import time
+import numpy as np
 from flask import Flask, render_template, Response
-from datetime import datetime
+
+# uvloop is optional - drop-in libuv event loop, faster I/O multiplexing
+# than asyncio's default selector loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# waitress is optional - production WSGI server with C-accelerated I/O;
+# werkzeug's development server spawns a thread per connection and
+# re-parses HTTP with pure Python, which hurts with long-lived SSE
+# clients and polling frontends
+try:
+    from waitress import serve as _waitress_serve
+except ImportError:
+    _waitress_serve = None
+
+# orjson is optional - native JSON serializer, several times faster than
+# the stdlib on the float-heavy state vector and it returns bytes directly
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        # OPT_SERIALIZE_NUMPY writes the float32 state vector with
+        # vectorized code, no per-element boxing
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    import json
+
+    def _json_dumps(obj):
+        # default= covers the numpy state vector in the stdlib fallback
+        return json.dumps(obj, default=lambda o: o.tolist()).encode()
 
 # Import base server components
-from server import RobotDataStreamServicer as BaseServicer
-import robot_data_pb2
+from server import (RobotDataStreamServicer as BaseServicer,
+                    _format_timestamp, _SERVER_OPTIONS)
 import robot_data_pb2_grpc
 
 logging.basicConfig(
@@ -24,60 +55,102 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Global storage for latest data
-latest_data = {
+# Latest published data as an immutable snapshot dict, structure-of-
+# arrays (stable key list plus float32 value vector). The snapshot is
+# replaced wholesale on every update and read via _latest_ref[0], which
+# is a single atomic list-index load in CPython - HTTP readers take no
+# lock at all. Nothing may mutate a published snapshot.
+_latest_ref = [{
     'timestamp': None,
+    'timestamp_str': 'N/A',  # Formatted once at ingest, reused by all readers
     'robot_type': None,
     'device_id': None,
-    'state': {},  # Normalized state values [0.0, 1.0]
+    'state_keys': [],
+    'state_values': None,
     'connection_status': 'Waiting for connection...'
-}
-data_lock = threading.Lock()
+}]
+
+# Condition used purely to wake SSE generators when a snapshot lands
+data_cv = threading.Condition()
+
+
+def _publish(snapshot):
+    """Publish a new snapshot and wake waiting SSE streams"""
+    with data_cv:
+        _latest_ref[0] = snapshot
+        data_cv.notify_all()
 
 # Flask app for web interface
 app = Flask(__name__)
 
 
 class UIRobotDataStreamServicer(BaseServicer):
-    """Extended gRPC service with UI data storage"""
-    
-    def StreamData(self, request_iterator, context):
-        """Handle streaming robot data and update UI state"""
-        logger.info("Client connected to stream")
-        
-        try:
-            for reading in request_iterator:
-                # Update global data for UI
-                with data_lock:
-                    latest_data['timestamp'] = reading.timestamp
-                    latest_data['robot_type'] = reading.robot_type
-                    latest_data['device_id'] = reading.device_id
-                    latest_data['state'] = dict(reading.state)
-                    latest_data['connection_status'] = 'Connected'
-                
-                # Log received data
-                timestamp_str = datetime.fromtimestamp(
-                    reading.timestamp
-                ).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                
-                logger.info(f"Received from {reading.robot_type} (ID: {reading.device_id})")
-                logger.info(f"  Timestamp: {timestamp_str}")
-                logger.info(f"  State ({len(reading.state)} values, normalized to [0, 1])")
-                
-                # Send acknowledgment
-                response = robot_data_pb2.RobotResponse(
-                    success=True,
-                    message=f"Received data with {len(reading.state)} state values"
-                )
-                yield response
-                
-        except Exception as e:
-            logger.error(f"Error in stream: {e}")
-            with data_lock:
-                latest_data['connection_status'] = f'Error: {str(e)}'
-        finally:
-            logger.info("Client disconnected from stream")
-            with data_lock:
-                latest_data['connection_status'] = 'Disconnected'
+    """Extended gRPC service with UI data storage.
+
+    The stream body (schema handling, acks, logging) runs in the base
+    servicer; this class only overrides the hooks that publish readings
+    and connection status as UI snapshots.
+    """
+
+    def __init__(self):
+        # Memoized list form of the last schema tuple seen, so the
+        # packed path reuses one stable key list per stream
+        self._keys_tuple = None
+        self._keys_list = None
+
+    def _state_arrays(self, reading, joint_keys):
+        """Split a reading into (key list, float32 value vector).
+
+        Structure-of-arrays: keys stay a stable list, values go into one
+        fresh float32 vector per frame; the legacy keyed map is unpacked
+        the same way for older clients.
+        """
+        if joint_keys and (reading.state_blob or reading.values):
+            if joint_keys is not self._keys_tuple:
+                self._keys_tuple = joint_keys
+                self._keys_list = list(joint_keys)
+            if reading.state_blob:
+                # Single memcpy decode of the little-endian float32 blob
+                values = np.frombuffer(reading.state_blob, dtype='<f4')
+            else:
+                values = np.asarray(reading.values, dtype=np.float32)
+            return self._keys_list, values
+        return (list(reading.state),
+                np.fromiter(reading.state.values(), dtype=np.float32,
+                            count=len(reading.state)))
+
+    def _handle_reading(self, reading, joint_keys):
+        """Publish the reading to the UI, then log via the base helper"""
+        # A re-sent timestamp (client retry) carries nothing new: skip
+        # the snapshot build, the lock and the SSE wake-up entirely
+        if reading.timestamp == _latest_ref[0]['timestamp']:
+            return
+
+        keys, values = self._state_arrays(reading, joint_keys)
+
+        # Format the timestamp once here; /data, /stream and the log
+        # line below all reuse the same string
+        timestamp_str = _format_timestamp(reading.timestamp)
+
+        _publish({
+            'timestamp': reading.timestamp,
+            'timestamp_str': timestamp_str,
+            'robot_type': reading.robot_type,
+            'device_id': reading.device_id,
+            'state_keys': keys,
+            'state_values': values,
+            'connection_status': 'Connected',
+        })
+
+        if logger.isEnabledFor(logging.INFO):
+            self._log_reading(reading, joint_keys, timestamp_str)
+
+    def _on_stream_error(self, error):
+        _publish(dict(_latest_ref[0],
+                      connection_status=f'Error: {str(error)}'))
+
+    def _on_stream_end(self):
+        _publish(dict(_latest_ref[0], connection_status='Disconnected'))
 
 
 @app.route('/')
@@ -89,84 +162,96 @@ def index():
 @app.route('/data')
 def get_data():
     """API endpoint for latest data"""
-    with data_lock:
-        data_copy = latest_data.copy()
-        
-    # Add human-readable timestamp
-    if data_copy['timestamp']:
-        data_copy['timestamp_str'] = datetime.fromtimestamp(
-            data_copy['timestamp']
-        ).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-    else:
-        data_copy['timestamp_str'] = 'N/A'
-    
-    return json.dumps(data_copy)
+    # Lock-free: one atomic load of the current immutable snapshot
+    return Response(_json_dumps(_latest_ref[0]),
+                    mimetype='application/json')
 
 
 @app.route('/stream')
 def stream():
     """Server-Sent Events stream for real-time updates"""
     def generate():
-        last_timestamp = None
+        last_snap = None
         while True:
-            with data_lock:
-                current_timestamp = latest_data.get('timestamp')
-                
-                # Only send if data has changed
-                if current_timestamp != last_timestamp:
-                    data_copy = latest_data.copy()
-                    if data_copy['timestamp']:
-                        data_copy['timestamp_str'] = datetime.fromtimestamp(
-                            data_copy['timestamp']
-                        ).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                    else:
-                        data_copy['timestamp_str'] = 'N/A'
-                    
-                    yield f"data: {json.dumps(data_copy)}\n\n"
-                    last_timestamp = current_timestamp
-            
-            time.sleep(0.03)  # ~30 Hz update rate
-    
+            with data_cv:
+                # Sleep until a new snapshot is published; the timeout
+                # only bounds how long a dead connection lingers, there
+                # is no periodic polling. Identity comparison also
+                # catches status-only updates.
+                if _latest_ref[0] is last_snap:
+                    data_cv.wait(timeout=1.0)
+                snap = _latest_ref[0]
+
+            if snap is last_snap:
+                continue
+            last_snap = snap
+
+            # Serialize and send outside the lock; the snapshot is
+            # immutable so no copy is needed
+            yield b"data: " + _json_dumps(snap) + b"\n\n"
+
     return Response(generate(), mimetype='text/event-stream')
 
 
-def serve_grpc(port=50051):
-    """Start gRPC server with UI servicer"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+async def serve_grpc(port=50051):
+    """Start asyncio gRPC server with UI servicer"""
+    server = grpc.aio.server(options=_SERVER_OPTIONS)
     robot_data_pb2_grpc.add_RobotDataStreamServicer_to_server(
         UIRobotDataStreamServicer(), server
     )
     server.add_insecure_port(f'[::]:{port}')
-    server.start()
+    await server.start()
     logger.info(f"gRPC server started on port {port}")
     return server
 
 
 def serve_web(host='0.0.0.0', port=8080):
-    """Start Flask web server"""
+    """Start Flask web server (waitress when installed)"""
     logger.info(f"Web UI available at http://{host}:{port}")
-    app.run(host=host, port=port, debug=False, threaded=True)
+    if _waitress_serve is not None:
+        _waitress_serve(app, host=host, port=port, threads=8,
+                        connection_limit=1000, channel_timeout=300)
+    else:
+        logger.warning("waitress not installed; falling back to Flask's development server")
+        app.run(host=host, port=port, debug=False, threaded=True)
+
+
+async def _run(grpc_port, host, web_port):
+    """Host gRPC on the event loop with Flask on its own thread"""
+    grpc_server = await serve_grpc(port=grpc_port)
+
+    # Flask stays on a daemon thread; its blocking WSGI loop must not
+    # share the event loop that multiplexes the gRPC streams
+    web_thread = threading.Thread(
+        target=serve_web,
+        kwargs={'host': host, 'port': web_port},
+        daemon=True
+    )
+    web_thread.start()
+
+    try:
+        await grpc_server.wait_for_termination()
+    finally:
+        await grpc_server.stop(0)
 
 
 def main():
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='Robot gRPC Server with Web UI')
     parser.add_argument('--grpc-port', type=int, default=50051, help='gRPC port (default: 50051)')
     parser.add_argument('--web-port', type=int, default=8080, help='Web server port (default: 8080)')
     parser.add_argument('--host', default='0.0.0.0', help='Web server host (default: 0.0.0.0)')
     args = parser.parse_args()
-    
-    # Start gRPC server in background
-    grpc_server = serve_grpc(port=args.grpc_port)
-    
+
+    if uvloop is not None:
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+
     try:
-        # Start web server (blocking)
-        serve_web(host=args.host, port=args.web_port)
+        asyncio.run(_run(args.grpc_port, args.host, args.web_port))
     except KeyboardInterrupt:
         logger.info("Shutting down server...")
-    finally:
-        grpc_server.stop(0)
 
 
 if __name__ == '__main__':